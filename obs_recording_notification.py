@@ -1,6 +1,9 @@
 import tkinter as tk
-from tkinter import *
+from tkinter import Frame, Canvas, Label, BOTH
 import threading
+import queue
+import time
+from collections import deque
 import obspython as obs
 
 try:
@@ -21,47 +24,115 @@ class Config:
     position_center = True  # True=center, False=top-right
 
 
-def _play_sound_thread(alias, fallback_freq, fallback_duration, fallback_count):
-    """Play Windows system sound synchronously in a background thread.
+# Notification codes posted from the OBS thread to the Tk thread
+REC_STARTED, REC_PAUSED, REC_UNPAUSED, REC_SAVED, REPLAY_SAVED = range(5)
 
-    Using SND_NODEFAULT ensures we fail explicitly if the alias is missing
-    from the Windows registry, rather than silently playing the default sound.
-    Fallback to Beep() provides audible feedback even on misconfigured systems.
 
-    Args:
-        alias: Windows sound alias (e.g., "DeviceConnect", "SystemHand").
-        fallback_freq: Beep frequency in Hz if alias fails.
-        fallback_duration: Beep duration in ms.
-        fallback_count: Number of fallback beeps to play.
+def _draw_rec_started(canvas, c, **opts):
+    """Red dot."""
+    canvas.create_oval(c['dot'], fill='#ff3333', **opts)
+
+
+def _draw_rec_paused(canvas, c, **opts):
+    """Orange pause bars."""
+    canvas.create_rectangle(c['pause_l'], fill='#ff9900', outline='#ff9900', **opts)
+    canvas.create_rectangle(c['pause_r'], fill='#ff9900', outline='#ff9900', **opts)
+
+
+def _draw_rec_unpaused(canvas, c, **opts):
+    """Green play triangle."""
+    canvas.create_polygon(c['play'], fill='#00cc00', outline='#00cc00', **opts)
+
+
+def _draw_rec_saved(canvas, c, **opts):
+    """Green checkmark."""
+    canvas.create_line(c['check_l'], fill='#00cc00', width=c['line_w'], **opts)
+    canvas.create_line(c['check_r'], fill='#00cc00', width=c['line_w'], **opts)
+
+
+def _draw_replay_saved(canvas, c, **opts):
+    """Blue dot."""
+    canvas.create_oval(c['dot'], fill='#0099ff', **opts)
+
+
+# Label text and indicator drawer for each notification code, indexed by code
+_LABELS = (
+    "Recording Started",
+    "Recording Paused",
+    "Recording Resumed",
+    "Recording Saved",
+    "Replay Saved",
+)
+_DRAWERS = (
+    _draw_rec_started,
+    _draw_rec_paused,
+    _draw_rec_unpaused,
+    _draw_rec_saved,
+    _draw_replay_saved,
+)
+
+# Window for coalescing back-to-back notifications into one redraw
+NOTIFY_DEBOUNCE_MS = 40
+
+# Fade animation: target frame interval and total fade time
+FADE_FRAME_MS = 30
+FADE_DURATION = 0.27  # seconds, nine 30 ms frames
+
+# Opacity levels as pre-formatted Tcl strings, indexed by fade step (0.9 peak)
+_ALPHAS = ('0.0', '0.1', '0.2', '0.3', '0.4', '0.5', '0.6', '0.7', '0.8', '0.9')
+_MAX_ALPHA_STEP = len(_ALPHAS) - 1
+
+
+def _sound_worker():
+    """Play queued notification sounds on a single long-lived daemon thread.
+
+    Blocks in Queue.get() while idle, so it costs nothing until a sound is
+    requested. PlaySound is called synchronously here, off the OBS thread:
+    with SND_NODEFAULT it then fails explicitly if the alias is missing from
+    the Windows registry, rather than silently playing the default sound,
+    and the Beep() fallback provides audible feedback instead.
+    Each queue item is (alias, fallback_freq, fallback_duration, fallback_count);
+    an alias of None plays only the beeps.
     """
-    try:
-        winsound.PlaySound(alias, winsound.SND_ALIAS | winsound.SND_NODEFAULT)
-    except:
+    while True:
+        alias, fallback_freq, fallback_duration, fallback_count = _sound_q.get()
+        if alias is not None:
+            try:
+                winsound.PlaySound(alias, winsound.SND_ALIAS | winsound.SND_NODEFAULT)
+                continue
+            except RuntimeError:
+                pass
         try:
             for _ in range(fallback_count):
                 winsound.Beep(fallback_freq, fallback_duration)
-        except:
+        except RuntimeError:
             pass
 
 
+_sound_q = queue.Queue()
+_last_queued_sound = None
+if SOUNDS_AVAILABLE:
+    threading.Thread(target=_sound_worker, daemon=True).start()
+
+
 def _warmup_sound():
     """Initialize Windows audio subsystem with inaudible beep.
 
     PlaySound(None) is a no-op that doesn't actually initialize audio.
     A real Beep call triggers the audio driver initialization, avoiding
-    ~100-500ms latency on the first notification sound.
+    ~100-500ms latency on the first notification sound. The beep is queued
+    for the sound worker so it never blocks the OBS thread.
     """
     if SOUNDS_AVAILABLE:
-        try:
-            winsound.Beep(37, 1)  # 37Hz for 1ms - inaudible
-        except:
-            pass
+        _sound_q.put((None, 37, 1, 1))  # 37Hz for 1ms - inaudible
 
 
 def play_sound(alias, fallback_freq, fallback_duration, fallback_count=1):
-    """Play a Windows system sound asynchronously with fallback beeps.
+    """Queue a Windows system sound, with fallback beeps, for the sound worker.
 
-    Spawns a daemon thread to avoid blocking OBS. Respects Config.sounds_enabled.
+    Returns immediately so OBS is never blocked. A request identical to the
+    last one still waiting in the queue is dropped, so bursts (e.g. replay
+    saves) don't pile up repeated sounds. Respects Config.sounds_enabled.
 
     Args:
         alias: Windows sound alias from registry (e.g., "DeviceConnect").
@@ -71,11 +142,13 @@ def play_sound(alias, fallback_freq, fallback_duration, fallback_count=1):
     """
     if not SOUNDS_AVAILABLE or not Config.sounds_enabled:
         return
-    threading.Thread(
-        target=_play_sound_thread,
-        args=(alias, fallback_freq, fallback_duration, fallback_count),
-        daemon=True
-    ).start()
+    global _last_queued_sound
+    item = (alias, fallback_freq, fallback_duration, fallback_count)
+    # FIFO: if the queue is non-empty, the last item put is still pending
+    if item == _last_queued_sound and not _sound_q.empty():
+        return
+    _last_queued_sound = item
+    _sound_q.put(item)
 
 
 class Application(tk.Frame):
@@ -83,10 +156,10 @@ class Application(tk.Frame):
 
     Displays recording/replay status with an indicator icon and text label.
     Supports animation interrupts for rapid successive notifications.
+    Notifications are posted from the OBS thread via notify(), which wakes the
+    Tk thread with a <<Notify>> virtual event instead of polling.
 
     Attributes:
-        is_animating: Whether a fade animation is currently running.
-        pending_notification: Flag to interrupt current animation for new notification.
         scale: UI scale factor based on screen resolution (1.0 at 1080p).
     """
 
@@ -96,10 +169,16 @@ class Application(tk.Frame):
         self.config(bg="#1a1a1a")
         self.pack()
 
+        # Screen size rarely changes; cache it and refresh on root <Configure>
+        self._screen_w = self.master.winfo_screenwidth()
+        self._screen_h = self.master.winfo_screenheight()
+        self.master.bind('<Configure>', self._on_configure)
+
         # Dynamic position based on config
         self.update_position()
 
-        self.master.attributes('-alpha', 0.0)  # Start hidden
+        self._alpha_step = 0  # Index into _ALPHAS; cached so fades never read -alpha back from Tk
+        self.master.attributes('-alpha', _ALPHAS[self._alpha_step])  # Start hidden
         self.master.configure(bg='#0f0f0f')  # Darker background
         self.master.overrideredirect(1)  # Borderless window
         self.master.attributes('-topmost', True)  # Always on top
@@ -108,10 +187,16 @@ class Application(tk.Frame):
         self.master.attributes('-transparentcolor', '#0f0f0f')
         self.config(bg='#0f0f0f')
 
-        self.is_animating = False
-        self.pending_notification = False
         self._fade_timer = None
         self._fadeout_timer = None
+        self._fade_start = 0.0
+        self._last_frame = 0.0
+        self._frame_ema = float(FADE_FRAME_MS)  # Smoothed real frame interval in ms
+        # deque append/popleft are thread-safe, so the OBS thread can push directly
+        self._notify_queue = deque()
+        self.master.bind('<<Notify>>', self._on_notify)
+        self._pending = None
+        self._flush_scheduled = False
 
         # Modern container frame with subtle border
         container = Frame(self, bg='#252525', bd=0, highlightthickness=1,
@@ -119,45 +204,83 @@ class Application(tk.Frame):
         container.pack(padx=5, pady=5, fill=BOTH, expand=True)
 
         # Calculate scale factor based on screen width
-        screen_w = self.master.winfo_screenwidth()
-        self.scale = max(1.0, screen_w / 1920)  # 1.0 at 1080p, scales up for higher res
+        self.scale = max(1.0, self._screen_w / 1920)  # 1.0 at 1080p, scales up for higher res
         canvas_size = int(30 * self.scale)
         font_size = int(11 * self.scale)
 
+        # Indicator geometry is fixed for the window's lifetime, so scale it once
+        s = self.scale
+        def px(*values):
+            return tuple(int(v * s) for v in values)
+        self._coords = {
+            'shadow': px(5, 5, 25, 25),
+            'border': px(6, 6, 24, 24),
+            'dot': px(8, 8, 22, 22),
+            'pause_l': px(12, 10, 15, 20),
+            'pause_r': px(17, 10, 20, 20),
+            'play': px(12, 10, 12, 20, 22, 15),
+            'check_l': px(10, 15, 15, 20),
+            'check_r': px(15, 20, 22, 10),
+            'line_w': int(3 * s),
+        }
+
         self.canvas = Canvas(container, height=canvas_size, width=canvas_size, bg='#252525', highlightthickness=0)
         self.canvas.grid(row=0, column=0, padx=(10,5), pady=5)
-        self._draw_indicator('recording', 'started')
+        self._build_indicators()
+        self._draw_indicator(REC_STARTED)
 
         self.label = Label(container, text="Recording Started", font=('Segoe UI', font_size, 'bold'))
         self.label.grid(row=0, column=1, padx=(0,15), pady=5)
         self.label.config(bg="#252525", fg="#ffffff")
 
-    def _draw_indicator(self, ntype, state):
-        """Draw the notification indicator icon, scaled for resolution."""
-        s = self.scale
-        self.canvas.delete("all")
-        # Shadow and border (scaled)
-        self.canvas.create_oval(25*s, 25*s, 5*s, 5*s, outline='#000000', fill='#000000')
-        self.canvas.create_oval(24*s, 24*s, 6*s, 6*s, outline='#404040', fill='#252525')
-
-        if ntype == 'recording':
-            if state == 'started':
-                self.canvas.create_oval(22*s, 22*s, 8*s, 8*s, fill='#ff3333')
-            elif state == 'paused':
-                self.canvas.create_rectangle(12*s, 10*s, 15*s, 20*s, fill='#ff9900', outline='#ff9900')
-                self.canvas.create_rectangle(17*s, 10*s, 20*s, 20*s, fill='#ff9900', outline='#ff9900')
-            elif state == 'unpaused':
-                self.canvas.create_polygon(12*s, 10*s, 12*s, 20*s, 22*s, 15*s, fill='#00cc00', outline='#00cc00')
-            else:  # saved
-                self.canvas.create_line(10*s, 15*s, 15*s, 20*s, fill='#00cc00', width=int(3*s))
-                self.canvas.create_line(15*s, 20*s, 22*s, 10*s, fill='#00cc00', width=int(3*s))
-        elif ntype == 'replay':
-            self.canvas.create_oval(22*s, 22*s, 8*s, 8*s, fill='#0099ff')
+    def _build_indicators(self):
+        """Create every indicator icon once, hidden, from the pre-scaled coordinates.
 
-    def update_position(self):
-        """Update window position and size based on screen resolution."""
+        Each icon's items share a tag so _draw_indicator can switch icons by
+        toggling visibility instead of deleting and recreating canvas items.
+        """
+        c = self._coords
+        # Shadow and border
+        self.canvas.create_oval(c['shadow'], outline='#000000', fill='#000000')
+        self.canvas.create_oval(c['border'], outline='#404040', fill='#252525')
+        self._indicator_tags = tuple(f'indicator{code}' for code in range(len(_DRAWERS)))
+        for tag, draw in zip(self._indicator_tags, _DRAWERS):
+            draw(self.canvas, c, tags=tag, state='hidden')
+        self._last_drawn = None
+
+    def _draw_indicator(self, code):
+        """Show the indicator icon for a notification code, if not already shown."""
+        if code == self._last_drawn:
+            return
+        if self._last_drawn is not None:
+            self.canvas.itemconfigure(self._indicator_tags[self._last_drawn], state='hidden')
+        self.canvas.itemconfigure(self._indicator_tags[code], state='normal')
+        self._last_drawn = code
+
+    def _on_configure(self, event):
+        """Refresh the cached screen size and reposition if it changed."""
+        if event.widget is not self.master:
+            return
         screen_w = self.master.winfo_screenwidth()
         screen_h = self.master.winfo_screenheight()
+        if (screen_w, screen_h) != (self._screen_w, self._screen_h):
+            self._screen_w, self._screen_h = screen_w, screen_h
+            self.update_position()
+
+    def refresh_screen(self):
+        """Re-read the screen size and reposition the window.
+
+        Used on settings changes: a resolution change alone does not send a
+        root <Configure> unless the window moves, so the cache may be stale.
+        """
+        self._screen_w = self.master.winfo_screenwidth()
+        self._screen_h = self.master.winfo_screenheight()
+        self.update_position()
+
+    def update_position(self):
+        """Update window position and size based on the cached screen resolution."""
+        screen_w = self._screen_w
+        screen_h = self._screen_h
         # Scale window: width = 15% of screen, height proportional
         w = max(300, min(500, int(screen_w * 0.15)))
         h = max(55, int(w * 0.20))
@@ -168,88 +291,116 @@ class Application(tk.Frame):
             x = screen_w - w - 10
             y = 20
         self.master.geometry(f'{w}x{h}+{x}+{y}')
-        self.master.update_idletasks()
 
 
+    def _begin_fade(self):
+        """Record the fade start time; frames measure progress from here."""
+        self._fade_start = self._last_frame = time.perf_counter()
+
+    def _advance_fade(self):
+        """Return (progress, next_delay_ms) for the current fade frame.
+
+        Progress is based on real elapsed time, so slow frames still finish
+        the fade in FADE_DURATION. The next delay is corrected by a moving
+        average of the measured frame interval to stay near FADE_FRAME_MS.
+        """
+        now = time.perf_counter()
+        elapsed_ms = (now - self._last_frame) * 1000
+        self._last_frame = now
+        self._frame_ema = 0.8 * self._frame_ema + 0.2 * elapsed_ms
+        delay = max(1, int(FADE_FRAME_MS - (self._frame_ema - FADE_FRAME_MS)))
+        progress = min(1.0, (now - self._fade_start) / FADE_DURATION)
+        return progress, delay
+
+    def _set_alpha_step(self, step):
+        """Set window opacity to _ALPHAS[step], skipping the Tk call if unchanged."""
+        if step != self._alpha_step:
+            self._alpha_step = step
+            self.master.attributes('-alpha', _ALPHAS[step])
+
     def fade_in(self):
         """Animate window opacity from 0 to 0.9, then schedule fade_out."""
-        current = float(self.master.attributes('-alpha'))
-        if current < 0.9:
-            current += 0.1
-            self.master.attributes('-alpha', current)
-            self._fade_timer = self.after(30, self.fade_in)
+        self._begin_fade()
+        self._fade_timer = self.after(FADE_FRAME_MS, self._fade_in_step)
+
+    def _fade_in_step(self):
+        """Apply one fade-in frame and schedule the next, or the fade-out."""
+        progress, delay = self._advance_fade()
+        self._set_alpha_step(int(progress * _MAX_ALPHA_STEP + 0.5))
+        if progress < 1.0:
+            self._fade_timer = self.after(delay, self._fade_in_step)
         else:
             self._fadeout_timer = self.after(3000, self.fade_out)  # Stay visible for 3 seconds
 
     def fade_out(self):
-        """Animate window opacity from current to 0, then clear notification state."""
-        current = float(self.master.attributes('-alpha'))
-        if current > 0.1:
-            current -= 0.1
-            self.master.attributes('-alpha', current)
-            self._fade_timer = self.after(30, self.fade_out)
-        else:
-            self.is_animating = False
-            # Clear notification state after fade out completes
-            if hasattr(self, 'notification_type'):
-                delattr(self, 'notification_type')
-                delattr(self, 'notification_state')
-
-    def check_loop_status(self):
-        """Poll for pending notifications and trigger animations.
-
-        Runs in a 100ms polling loop. When notification_type/state are set,
-        updates the UI and starts fade_in. Interrupts current animation if
-        pending_notification is True.
+        """Animate window opacity from 0.9 to 0."""
+        self._begin_fade()
+        self._fade_timer = self.after(FADE_FRAME_MS, self._fade_out_step)
+
+    def _fade_out_step(self):
+        """Apply one fade-out frame and schedule the next until hidden."""
+        progress, delay = self._advance_fade()
+        self._set_alpha_step(_MAX_ALPHA_STEP - int(progress * _MAX_ALPHA_STEP + 0.5))
+        if progress < 1.0:
+            self._fade_timer = self.after(delay, self._fade_out_step)
+
+    def notify(self, code):
+        """Queue a notification code and wake the Tk thread. Safe to call from any thread."""
+        self._notify_queue.append(code)
+        self.master.event_generate('<<Notify>>', when='tail')
+
+    def _on_notify(self, event=None):
+        """Drain queued notifications on the Tk thread and debounce them.
+
+        Only the latest notification is kept; it is applied after a short
+        delay so rapid bursts (e.g. pause + resume) cause a single redraw.
         """
-        if not hasattr(self, 'notification_type'):
-            self.after(100, self.check_loop_status)
-            return
-
-        # Only start new animation if not animating OR if there's a pending notification
-        if self.is_animating and not self.pending_notification:
-            self.after(100, self.check_loop_status)
+        while self._notify_queue:
+            self._pending = self._notify_queue.popleft()
+        if self._pending is not None and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after(NOTIFY_DEBOUNCE_MS, self._flush_pending)
+
+    def _flush_pending(self):
+        """Show the most recent queued notification, interrupting any animation.
+
+        Updates the label and indicator for the pending code and starts
+        fade_in. This is the only place a notification is applied; nothing
+        is rescheduled once the fade finishes, so an idle window has no
+        pending timers.
+        """
+        self._flush_scheduled = False
+        code = self._pending
+        if code is None:
             return
+        self._pending = None
 
-        # If pending notification, interrupt current animation
-        if self.pending_notification:
-            if self._fade_timer:
-                self.after_cancel(self._fade_timer)
-            if self._fadeout_timer:
-                self.after_cancel(self._fadeout_timer)
-            self.master.attributes('-alpha', 0.0)
-            self.pending_notification = False
-
-        self.is_animating = True
+        if self._fade_timer:
+            self.after_cancel(self._fade_timer)
+        if self._fadeout_timer:
+            self.after_cancel(self._fadeout_timer)
+        self._set_alpha_step(0)
 
         # Update label text and indicator
-        labels = {
-            ('recording', 'started'): "Recording Started",
-            ('recording', 'paused'): "Recording Paused",
-            ('recording', 'unpaused'): "Recording Resumed",
-            ('recording', 'saved'): "Recording Saved",
-            ('replay', 'saved'): "Replay Saved",
-        }
-        self.label.config(text=labels.get((self.notification_type, self.notification_state), "Notification"))
-        self._draw_indicator(self.notification_type, self.notification_state)
+        self.label.config(text=_LABELS[code])
+        self._draw_indicator(code)
 
         self.fade_in()
-        self.after(100, self.check_loop_status)
-    
- 
+
+
 # Global reference to application instance
 app_instance = None
 
 def runtk():
     """Run the Tkinter main loop in a background thread.
 
-    Creates the Application instance, starts the notification polling loop,
-    and runs mainloop(). Clears app_instance on window close.
+    Creates the Application instance and runs mainloop(). Notifications
+    arrive as <<Notify>> events, so no polling loop is needed.
+    Clears app_instance on window close.
     """
     global app_instance
     app_instance = Application()
     app_instance.master.title('OBS Recording Notification')
-    app_instance.check_loop_status()
     app_instance.mainloop()
     app_instance = None  # Clear reference when window closes
         
@@ -265,7 +416,7 @@ def frontend_event_handler(data):
     """Handle OBS frontend events and trigger notifications.
 
     Responds to recording start/stop/pause/resume and replay buffer events.
-    Plays sounds and updates the notification window via thread-safe after() calls.
+    Plays sounds and posts to the notification window via thread-safe notify() calls.
 
     Args:
         data: OBS frontend event constant (e.g., OBS_FRONTEND_EVENT_RECORDING_STARTING).
@@ -283,48 +434,23 @@ def frontend_event_handler(data):
 
     if data == obs.OBS_FRONTEND_EVENT_RECORDING_STARTING:
         play_sound("DeviceConnect", 800, 200)
-        app_instance.after(0, lambda: (
-            setattr(app_instance, 'notification_type', 'recording'),
-            setattr(app_instance, 'notification_state', 'started'),
-            setattr(app_instance, 'pending_notification', True),
-            app_instance.check_loop_status()
-        ))
+        app_instance.notify(REC_STARTED)
 
     elif data == obs.OBS_FRONTEND_EVENT_RECORDING_STOPPED:
         play_sound("DeviceDisconnect", 400, 300)
-        app_instance.after(0, lambda: (
-            setattr(app_instance, 'notification_type', 'recording'),
-            setattr(app_instance, 'notification_state', 'saved'),
-            setattr(app_instance, 'pending_notification', True),
-            app_instance.check_loop_status()
-        ))
+        app_instance.notify(REC_SAVED)
 
     elif data == obs.OBS_FRONTEND_EVENT_RECORDING_PAUSED:
         play_sound("SystemHand", 600, 150, 2)
-        app_instance.after(0, lambda: (
-            setattr(app_instance, 'notification_type', 'recording'),
-            setattr(app_instance, 'notification_state', 'paused'),
-            setattr(app_instance, 'pending_notification', True),
-            app_instance.check_loop_status()
-        ))
+        app_instance.notify(REC_PAUSED)
 
     elif data == obs.OBS_FRONTEND_EVENT_RECORDING_UNPAUSED:
         play_sound("SystemAsterisk", 600, 100, 2)
-        app_instance.after(0, lambda: (
-            setattr(app_instance, 'notification_type', 'recording'),
-            setattr(app_instance, 'notification_state', 'unpaused'),
-            setattr(app_instance, 'pending_notification', True),
-            app_instance.check_loop_status()
-        ))
+        app_instance.notify(REC_UNPAUSED)
 
     elif data == obs.OBS_FRONTEND_EVENT_REPLAY_BUFFER_SAVED:
         play_sound("SystemNotification", 1000, 100, 3)
-        app_instance.after(0, lambda: (
-            setattr(app_instance, 'notification_type', 'replay'),
-            setattr(app_instance, 'notification_state', 'saved'),
-            setattr(app_instance, 'pending_notification', True),
-            app_instance.check_loop_status()
-        ))
+        app_instance.notify(REPLAY_SAVED)
 
 
 
@@ -360,7 +486,7 @@ def script_update(settings):
     Config.sounds_enabled = obs.obs_data_get_bool(settings, "sounds_enabled")
     Config.position_center = obs.obs_data_get_bool(settings, "position_center")
     if app_instance and hasattr(app_instance, 'master') and app_instance.master.winfo_exists():
-        app_instance.after(0, app_instance.update_position)
+        app_instance.after(0, app_instance.refresh_screen)
 
 
 obs.obs_frontend_add_event_callback(frontend_event_handler)